@@ -1,11 +1,17 @@
 # app/api/routes/scan.py
 
+import asyncio
 import logging
 import os
 import time
-from fastapi import APIRouter, Body, Depends, Header, Query
-from fastapi.responses import JSONResponse
+import uuid
+from hashlib import blake2b
 
+import orjson
+from fastapi import APIRouter, Body, Depends, Header, Query, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from app.compression import etag_matches
 from app.licensing import require_licensed_session
 from app.services.correction_feedback_service import submit_correction_feedback
 from app.services.internal_beta_review_service import get_internal_beta_review_summary
@@ -16,6 +22,9 @@ logger = logging.getLogger("noesisfood.scan")
 
 router = APIRouter()
 
+# Upper bound on barcodes per POST /scan so one request cannot drain the OFF connection pool
+SCAN_BATCH_MAX_IDS = 20
+
 
 def _error_status(data: dict) -> int:
     code = str(data.get("error_code") or "").upper()
@@ -57,6 +66,29 @@ def _photo_payload_summary(payload: dict) -> dict:
     }
 
 
+# Same options ORJSONResponse.render uses
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# Stands in for meta.performance while the body is rendered and hashed; swapped back into the bytes afterwards
+_PERFORMANCE_PLACEHOLDER = f"__performance_{uuid.uuid4().hex}__"
+
+
+def _render_scan(data: dict) -> tuple[bytes, str]:
+    """
+    Render the scan result once and derive its ETag from the same bytes.
+    meta.performance carries per-request timings, so it is left out of the hash.
+    """
+    meta = data.get("meta")
+    if not isinstance(meta, dict) or "performance" not in meta:
+        body = orjson.dumps(data, option=_ORJSON_OPTIONS)
+        return body, f'"{blake2b(body, digest_size=8).hexdigest()}"'
+    stable = orjson.dumps({**data, "meta": {**meta, "performance": _PERFORMANCE_PLACEHOLDER}}, option=_ORJSON_OPTIONS)
+    etag = f'"{blake2b(stable, digest_size=8).hexdigest()}"'
+    body = stable.replace(
+        orjson.dumps(_PERFORMANCE_PLACEHOLDER), orjson.dumps(meta["performance"], option=_ORJSON_OPTIONS), 1
+    )
+    return body, etag
+
+
 def _beta_review_token_valid(header_value: str | None) -> tuple[bool, bool]:
     configured = str(os.environ.get("BETA_REVIEW_TOKEN") or "").strip()
     if not configured:
@@ -64,8 +96,8 @@ def _beta_review_token_valid(header_value: str | None) -> tuple[bool, bool]:
     provided = str(header_value or "").strip()
     return provided == configured, True
 
-@router.get("/scan/{key}", dependencies=[Depends(require_licensed_session)])
-async def scan_endpoint(key: str, lang: str = Query("en")):
+@router.get("/scan/{key}", dependencies=[Depends(require_licensed_session)], response_class=ORJSONResponse)
+async def scan_endpoint(request: Request, key: str, lang: str = Query("en")):
     started_at = time.perf_counter()
     lang = lang if lang in {"el", "en", "de", "fr"} else "en"
     log_event(logger, "scan_started", source="barcode", key=str(key or "").strip(), lang=lang)
@@ -100,7 +132,7 @@ async def scan_endpoint(key: str, lang: str = Query("en")):
                 error_code=str(data.get("error_code") or ""),
                 status_code=_error_status(data),
             )
-            return JSONResponse(status_code=_error_status(data), content=data)
+            return ORJSONResponse(status_code=_error_status(data), content=data)
         if isinstance(data, dict):
             log_event(
                 logger,
@@ -112,6 +144,12 @@ async def scan_endpoint(key: str, lang: str = Query("en")):
                 analysis_confidence=str(data.get("analysis_confidence") or ""),
                 route_total_ms=int(round((time.perf_counter() - started_at) * 1000.0)),
             )
+            # Already plain JSON data: render directly instead of a jsonable_encoder pass over the whole result
+            body, etag = _render_scan(data)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                # A 304 repeats the Vary the 200 carries once the gzip middleware has encoded it
+                return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+            return Response(body, media_type="application/json", headers={"ETag": etag})
         return data
     except Exception as e:
         # This prints full traceback in Render logs
@@ -135,6 +173,45 @@ async def scan_endpoint(key: str, lang: str = Query("en")):
         )
 
 
+@router.post("/scan", dependencies=[Depends(require_licensed_session)], response_class=ORJSONResponse)
+async def scan_batch_endpoint(payload: dict = Body(default={}), lang: str = Query("en")):
+    lang = lang if lang in {"el", "en", "de", "fr"} else "en"
+    ids = (payload or {}).get("ids")
+    keys = [str(item or "").strip() for item in ids] if isinstance(ids, list) else []
+    if not keys or len(keys) > SCAN_BATCH_MAX_IDS or not all(keys):
+        return ORJSONResponse(
+            status_code=400,
+            content={
+                "error": f"Provide 1-{SCAN_BATCH_MAX_IDS} non-empty barcodes in 'ids'.",
+                "error_code": "INVALID_BATCH",
+            },
+        )
+    log_event(logger, "scan_started", source="batch", lang=lang, count=len(keys))
+    # Duplicate barcodes share one lookup; results keep the request order
+    unique_keys = list(dict.fromkeys(keys))
+    outcomes = await asyncio.gather(*(scan_product(k, lang=lang) for k in unique_keys), return_exceptions=True)
+    by_key = {}
+    for k, outcome in zip(unique_keys, outcomes):
+        # BaseException: gather(return_exceptions=True) also hands back CancelledError
+        if isinstance(outcome, BaseException):
+            logger.error("Batch scan failed for key=%s", k, exc_info=outcome)
+            outcome = {
+                "error": "This product could not be analyzed.",
+                "error_code": "ANALYSIS_UNAVAILABLE",
+            }
+        by_key[k] = outcome
+    results = [by_key[k] for k in keys]
+    log_event(
+        logger,
+        "scan_completed",
+        source="batch",
+        lang=lang,
+        count=len(keys),
+        failed=sum(1 for r in results if isinstance(r, dict) and r.get("error")),
+    )
+    return ORJSONResponse(content={"results": results})
+
+
 @router.post("/scan/manual", dependencies=[Depends(require_licensed_session)])
 async def scan_manual_endpoint(payload: dict = Body(default={}), lang: str = Query("en")):
     lang = lang if lang in {"el", "en", "de", "fr"} else "en"
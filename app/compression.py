@@ -0,0 +1,62 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Only text-like payloads shrink under gzip; images/fonts are already compressed
+GZIP_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison (RFC 9110 13.1.2), as If-None-Match requires: a gzip variant
+    carries a weak tag, so W/"x" and "x" both match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+class _TextGZipResponder(GZipResponder):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_weak_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if headers.get("content-encoding") == "gzip" and "etag" in headers:
+                    # The encoded bytes differ from the identity variant, so its strong tag no longer applies
+                    headers["etag"] = weak_etag(headers["etag"])
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_weak_etag)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            await super().send_with_compression(message)
+            if not content_type.startswith(GZIP_CONTENT_TYPES):
+                self.content_type_is_excluded = True
+            return
+        await super().send_with_compression(message)
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips non-text responses and weakens the ETag of gzipped ones."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _TextGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
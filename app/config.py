@@ -39,6 +39,7 @@ class Settings:
     play_integrity_token_max_age_seconds: int
     public_base_url: str
     cors_allowed_origins: list[str]
+    cors_max_age_seconds: int
     license_state_backend: str
     redis_url: str
     license_challenge_rate_limit_per_minute: int
@@ -47,6 +48,7 @@ class Settings:
     play_integrity_max_concurrent_decodes: int
     invalid_token_deny_ttl_seconds: int
     trusted_proxy_hops: int
+    threadpool_max_threads: int
 
     @property
     def is_production(self) -> bool:
@@ -71,6 +73,7 @@ def get_settings() -> Settings:
         public_base_url=os.environ.get("PUBLIC_BASE_URL", "https://noesisfood.app").strip()
         or "https://noesisfood.app",
         cors_allowed_origins=_env_list("CORS_ALLOWED_ORIGINS", "https://noesisfood.app"),
+        cors_max_age_seconds=_env_int("CORS_MAX_AGE_SECONDS", 86400),
         license_state_backend=os.environ.get("LICENSE_STATE_BACKEND", "memory").strip().lower() or "memory",
         redis_url=os.environ.get("REDIS_URL", "").strip(),
         license_challenge_rate_limit_per_minute=_env_int("LICENSE_CHALLENGE_RATE_LIMIT_PER_MINUTE", 10),
@@ -79,6 +82,7 @@ def get_settings() -> Settings:
         play_integrity_max_concurrent_decodes=_env_int("PLAY_INTEGRITY_MAX_CONCURRENT_DECODES", 5),
         invalid_token_deny_ttl_seconds=_env_int("INVALID_TOKEN_DENY_TTL_SECONDS", 60),
         trusted_proxy_hops=_env_int("TRUSTED_PROXY_HOPS", 1),
+        threadpool_max_threads=_env_int("THREADPOOL_MAX_THREADS", 100),
     )
 
 
@@ -1,5 +1,6 @@
 # app/main.py
 
+import gzip
 import hashlib
 import json
 import logging
@@ -7,24 +8,28 @@ import re
 import uuid
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.exception_handlers import request_validation_exception_handler
-from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.responses import FileResponse, ORJSONResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes.license import router as license_router
 from app.api.routes.scan import router as scan_router
+from app.compression import TextGZipMiddleware, etag_matches, weak_etag
 from app.config import get_settings, validate_runtime_settings
 from app.licensing import request_has_active_licensed_session
+from app.services.openfoodfacts_service import close_off_client
 
-app = FastAPI(title="NoesisFood API", version="0.3.1")
+app = FastAPI(title="NoesisFood API", version="0.3.1", default_response_class=ORJSONResponse)
 logger = logging.getLogger("noesisfood.license")
 
 
 _LICENSE_REQUEST_ID_STATE_KEY = "noesisfood_license_request_id"
 _ASCII_WHITESPACE = frozenset(b" \t\r\n\f\v")
+_HTML_CACHE: dict[str, dict] = {}
 
 
 def _body_edge_category(value: int | None) -> str:
@@ -244,9 +249,11 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=settings.cors_max_age_seconds,
 )
+app.add_middleware(TextGZipMiddleware, minimum_size=500)
 
 
 @app.middleware("http")
@@ -340,22 +347,34 @@ async def log_license_runtime_shape():
     )
 
 
+@app.on_event("startup")
+async def raise_threadpool_limit():
+    # Sync dependencies and file I/O run on anyio's worker threads; the default 40 starve under concurrent scans
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(1, get_settings().threadpool_max_threads)
+
+
+@app.on_event("shutdown")
+async def close_openfoodfacts_client():
+    await close_off_client()
+
+
 @app.get("/")
 async def serve_ui(request: Request):
     settings = get_settings()
     if settings.app_access_lockdown_enabled and not await request_has_active_licensed_session(request, settings=settings):
-        return _html_response(LANDING_FILE, public=True)
-    return _html_response(INDEX_FILE, public=False)
+        return _html_response(LANDING_FILE, public=True, request=request)
+    return _html_response(INDEX_FILE, public=False, request=request)
 
 
 @app.get("/privacy")
-async def serve_privacy():
-    return _html_response(PRIVACY_FILE, public=True)
+async def serve_privacy(request: Request):
+    return _html_response(PRIVACY_FILE, public=True, request=request)
 
 
 @app.get("/data-deletion")
-async def serve_data_deletion():
-    return _html_response(DATA_DELETION_FILE, public=True)
+async def serve_data_deletion(request: Request):
+    return _html_response(DATA_DELETION_FILE, public=True, request=request)
 
 
 @app.get("/manifest.webmanifest")
@@ -406,7 +425,7 @@ async def serve_static_asset(asset_path: str, request: Request):
     settings = get_settings()
     if settings.app_access_lockdown_enabled and not await request_has_active_licensed_session(request, settings=settings):
         if normalized.endswith(".html"):
-            return _html_response(LANDING_FILE, public=True)
+            return _html_response(LANDING_FILE, public=True, request=request)
         return PlainTextResponse("Not found", status_code=404, headers=_cache_headers(public=False))
     target = FRONTEND_DIR / normalized
     if not target.is_file() or FRONTEND_DIR not in target.resolve().parents:
@@ -414,8 +433,38 @@ async def serve_static_asset(asset_path: str, request: Request):
     return FileResponse(str(target), headers=_cache_headers(public=False))
 
 
-def _html_response(path: Path, public: bool) -> FileResponse:
-    return FileResponse(str(path), media_type="text/html", headers=_cache_headers(public=public))
+def _html_response(path: Path, public: bool, request: Request | None = None) -> Response:
+    page = _cached_html(path)
+    headers = {**_cache_headers(public=public), "Vary": "Accept-Encoding"}
+    body, etag = page["body"], page["etag"]
+    if request is not None and page["body_gzip"] is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        # Pre-compressed variant: the gzip middleware passes already-encoded responses through
+        body, etag = page["body_gzip"], weak_etag(etag)
+        headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
+
+def _cached_html(path: Path) -> dict:
+    # Page bytes (plain + gzip) and ETag stay in memory until the file's mtime/size changes
+    stat = path.stat()
+    cache_entry = _HTML_CACHE.get(str(path))
+    if cache_entry and cache_entry["mtime_ns"] == stat.st_mtime_ns and cache_entry["size"] == stat.st_size:
+        return cache_entry
+    body = path.read_bytes()
+    body_gzip = gzip.compress(body, compresslevel=9, mtime=0)
+    cache_entry = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "body": body,
+        "body_gzip": body_gzip if len(body_gzip) < len(body) else None,
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    }
+    _HTML_CACHE[str(path)] = cache_entry
+    return cache_entry
 
 
 def _cache_headers(public: bool) -> dict[str, str]:
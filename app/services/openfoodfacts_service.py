@@ -2,19 +2,49 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+import sqlite3
 import time
 
 import httpx
+import orjson
 
 # OpenFoodFacts endpoint (v2)
 OFF_BASE = "https://world.openfoodfacts.org"
 OFF_TIMEOUT_SEC = 12.0
+OFF_MAX_CONNECTIONS = 100
+OFF_MAX_KEEPALIVE_CONNECTIONS = 50
 
-# Πολύ απλό in-memory cache (για dev)
-_CACHE: Dict[str, Dict[str, Any]] = {}
+# In-memory LRU cache με TTL ανά entry: bounded, ώστε πολλά μοναδικά barcodes να μη μεγαλώνουν τη μνήμη
+_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 _CACHE_TTL_SEC = 10 * 60  # 10 λεπτά
+_CACHE_MAX_ENTRIES = 10_000
+# Πάνω από αυτό το μέγεθος τα TTL μειώνονται γραμμικά (memory pressure)
+_CACHE_LOW_WATER_ENTRIES = 7_500
+# Barcodes που δεν υπάρχουν στο OFF: μικρότερο TTL, ώστε να φαίνονται γρήγορα νέα προϊόντα
+_NEGATIVE_CACHE_TTL_SEC = 60
+
+# Optional L2 cache σε SQLite: τα OFF payloads επιβιώνουν από restarts/deploys (κενό path = ανενεργό)
+OFF_CACHE_DB_PATH = os.getenv("OFF_CACHE_DB_PATH", "").strip()
+_DISK_CACHE: Optional[sqlite3.Connection] = None
+_DISK_CACHE_PRUNE_EVERY = 500
+# Μετά από αποτυχία ανοίγματος, το L2 μένει ανενεργό τόσο χρόνο πριν ξαναδοκιμάσει
+_DISK_CACHE_RETRY_SEC = 5 * 60
+_disk_cache_writes = 0
+_disk_cache_retry_at = 0.0
+
+logger = logging.getLogger("noesisfood.openfoodfacts")
+
+# Shared pooled client: keeps TLS connections to OFF alive between scans
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# In-flight lookups: concurrent scans of the same barcode share one OFF request
+_INFLIGHT: Dict[str, "asyncio.Task[OFFResult]"] = {}
 
 
 @dataclass
@@ -31,16 +61,146 @@ def _now() -> float:
 
 def _cache_get(key: str) -> Optional[Dict[str, Any]]:
     item = _CACHE.get(key)
-    if not item:
+    if not item or _now() >= item["expires_at"]:
+        if item:
+            _CACHE.pop(key, None)
+        # L1 miss: fall through to the disk cache and promote a live entry
+        hit = _disk_cache_get(key)
+        if hit is None:
+            return None
+        expires_at, data = hit
+        # L2 holds the full TTL; under memory pressure the promoted copy gets the shrunk one
+        # (min also keeps the shorter remaining TTL of negative entries)
+        _l1_set(key, data, min(expires_at, _now() + _adaptive_ttl(_CACHE_TTL_SEC)))
+        return data
+    _CACHE.move_to_end(key)
+    return item["data"]
+
+
+def _adaptive_ttl(base: float) -> float:
+    """
+    Scale a TTL down as the cache fills up:
+    m = max(0, (used - low) / (high - low)), ttl = base * (1 - m),
+    floored at 10% of base so entries stay useful near the high-water mark.
+    """
+    used = len(_CACHE)
+    if used <= _CACHE_LOW_WATER_ENTRIES:
+        return base
+    pressure = min(1.0, (used - _CACHE_LOW_WATER_ENTRIES) / (_CACHE_MAX_ENTRIES - _CACHE_LOW_WATER_ENTRIES))
+    return base * max(0.1, 1.0 - pressure)
+
+
+def _l1_set(key: str, data: Dict[str, Any], expires_at: float) -> None:
+    _CACHE[key] = {"expires_at": expires_at, "data": data}
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > _CACHE_MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+
+
+def _cache_set(key: str, data: Dict[str, Any], ttl: float = _CACHE_TTL_SEC) -> None:
+    now = _now()
+    _l1_set(key, data, now + _adaptive_ttl(ttl))
+    # Disk is not memory-bound, so L2 keeps the full TTL
+    _disk_cache_set(key, data, now + ttl)
+
+
+def _get_disk_cache() -> Optional[sqlite3.Connection]:
+    global _DISK_CACHE, _disk_cache_retry_at
+    if _DISK_CACHE is None and OFF_CACHE_DB_PATH and _now() >= _disk_cache_retry_at:
+        try:
+            # Runs on the event loop: never wait on another worker's lock (busy timeout 0 -> SQLITE_BUSY = miss)
+            conn = sqlite3.connect(OFF_CACHE_DB_PATH, isolation_level=None, check_same_thread=False, timeout=0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS off_cache (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, data BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS off_cache_expires_at ON off_cache (expires_at)")
+            _DISK_CACHE = conn
+        except sqlite3.Error as e:
+            # One log line per failed attempt; scans run without L2 until the retry window passes
+            _disk_cache_retry_at = _now() + _DISK_CACHE_RETRY_SEC
+            logger.warning(
+                "OFF disk cache unavailable path=%s error=%s; retrying in %ss",
+                OFF_CACHE_DB_PATH,
+                e,
+                _DISK_CACHE_RETRY_SEC,
+            )
+    return _DISK_CACHE
+
+
+def _disk_cache_busy(e: sqlite3.Error) -> bool:
+    # Another worker holds the write lock; skipping is cheaper than blocking the loop
+    return getattr(e, "sqlite_errorcode", None) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def _disk_cache_get(key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+    conn = _get_disk_cache()
+    if conn is None:
         return None
-    if _now() - item["ts"] > _CACHE_TTL_SEC:
-        _CACHE.pop(key, None)
+    try:
+        row = conn.execute("SELECT expires_at, data FROM off_cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        if not _disk_cache_busy(e):
+            logger.warning("OFF disk cache read failed key=%s", key, exc_info=True)
         return None
-    return item["data"]
+    if row is None or _now() >= row[0]:
+        return None
+    try:
+        return row[0], orjson.loads(row[1])
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _disk_cache_set(key: str, data: Dict[str, Any], expires_at: float) -> None:
+    global _disk_cache_writes
+    conn = _get_disk_cache()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO off_cache (key, expires_at, data) VALUES (?, ?, ?)",
+            (key, expires_at, orjson.dumps(data)),
+        )
+        _disk_cache_writes += 1
+        if _disk_cache_writes % _DISK_CACHE_PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM off_cache WHERE expires_at <= ?", (_now(),))
+    except sqlite3.Error as e:
+        if not _disk_cache_busy(e):
+            logger.warning("OFF disk cache write failed key=%s", key, exc_info=True)
+    except TypeError:
+        logger.warning("OFF disk cache write failed key=%s", key, exc_info=True)
 
 
-def _cache_set(key: str, data: Dict[str, Any]) -> None:
-    _CACHE[key] = {"ts": _now(), "data": data}
+def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            base_url=OFF_BASE,
+            http2=True,
+            timeout=OFF_TIMEOUT_SEC,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=OFF_MAX_CONNECTIONS,
+                max_keepalive_connections=OFF_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            headers={"Accept": "application/json"},
+        )
+    return _CLIENT
+
+
+async def close_off_client() -> None:
+    """
+    Close the shared OpenFoodFacts client and disk cache (called on app shutdown).
+    Both are reopened lazily on the next fetch.
+    """
+    global _CLIENT, _DISK_CACHE
+    client, _CLIENT = _CLIENT, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    conn, _DISK_CACHE = _DISK_CACHE, None
+    if conn is not None:
+        conn.close()
 
 
 async def fetch_off_product(
@@ -62,33 +222,51 @@ async def fetch_off_product(
     cache_key = f"off:{barcode}"
     cached = _cache_get(cache_key)
     if cached is not None:
+        if cached.get("_neg"):
+            return OFFResult(ok=False, status=404, error="Product not found in OpenFoodFacts")
         return OFFResult(ok=True, status=200, payload=cached)
 
-    url = f"{OFF_BASE}/api/v2/product/{barcode}.json"
+    task = _INFLIGHT.get(cache_key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_uncached(barcode, cache_key, user_agent))
+        _INFLIGHT[cache_key] = task
+        task.add_done_callback(lambda done: _forget_inflight(cache_key, done))
+    # shield: a cancelled caller must not cancel the lookup other scans are awaiting
+    return await asyncio.shield(task)
 
-    headers = {
-        "User-Agent": user_agent,
-        "Accept": "application/json",
-    }
 
+def _forget_inflight(cache_key: str, task: "asyncio.Task[OFFResult]") -> None:
+    # A task from another event loop may have been replaced; never drop its successor
+    if _INFLIGHT.get(cache_key) is task:
+        del _INFLIGHT[cache_key]
+
+
+async def _fetch_uncached(barcode: str, cache_key: str, user_agent: str) -> OFFResult:
     try:
-        async with httpx.AsyncClient(timeout=OFF_TIMEOUT_SEC, follow_redirects=True) as client:
-            r = await client.get(url, headers=headers)
+        r = await _get_client().get(
+            f"/api/v2/product/{barcode}.json",
+            headers={"User-Agent": user_agent},
+        )
     except httpx.TimeoutException:
         return OFFResult(ok=False, status=504, error="OpenFoodFacts timeout")
     except Exception as e:
         return OFFResult(ok=False, status=502, error=f"OpenFoodFacts request failed: {e}")
 
+    if r.status_code == 404:
+        _cache_set(cache_key, {"_neg": True}, ttl=_NEGATIVE_CACHE_TTL_SEC)
+        return OFFResult(ok=False, status=404, error="Product not found in OpenFoodFacts")
+
     if r.status_code != 200:
         return OFFResult(ok=False, status=r.status_code, error=f"OpenFoodFacts HTTP {r.status_code}")
 
     try:
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception:
         return OFFResult(ok=False, status=502, error="Invalid JSON from OpenFoodFacts")
 
     # OFF: status 1 = found, status 0 = not found
     if str(data.get("status")) != "1" and data.get("product") is None:
+        _cache_set(cache_key, {"_neg": True}, ttl=_NEGATIVE_CACHE_TTL_SEC)
         return OFFResult(ok=False, status=404, error="Product not found in OpenFoodFacts")
 
     _cache_set(cache_key, data)
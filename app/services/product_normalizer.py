@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 
@@ -42,6 +43,9 @@ def is_placeholder_product_name(value: Any) -> bool:
 
 
 def _to_float(x: Any) -> Optional[float]:
+    # Fast path: OFF nutriments are mostly plain floats already
+    if type(x) is float:
+        return x
     try:
         if x is None:
             return None
@@ -67,45 +71,25 @@ def _optional_nonneg(x: Optional[float]) -> Optional[float]:
     return _clamp_nonneg(x)
 
 
-def _get_nutriment(nutriments: Dict[str, Any], *keys: str) -> Optional[float]:
-    for k in keys:
-        if k in nutriments:
-            v = _to_float(nutriments.get(k))
-            if v is not None:
-                return _clamp_nonneg(v)
-    return None
-
-
-def _get_energy_kcal(nutriments: Dict[str, Any]) -> Optional[float]:
-    direct_kcal = _get_nutriment(
-        nutriments,
+# Alias keys per canonical nutrient, in priority order (earlier aliases win when several are present)
+_NUTRIMENT_ALIAS_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "energy_kcal": (
         "energy-kcal_100g",
         "energy-kcal_100ml",
         "energy-kcal",
         "energy_kcal_100g",
         "energy_kcal_100ml",
         "energy_kcal",
-    )
-    if direct_kcal is not None:
-        return direct_kcal
-
-    kj = _get_nutriment(
-        nutriments,
+    ),
+    "energy_kj": (
         "energy-kj_100g",
         "energy-kj_100ml",
         "energy-kj",
         "energy_100g",
         "energy_100ml",
         "energy",
-    )
-    if kj is None:
-        return None
-    return round(kj / 4.184, 2)
-
-
-def _get_sugar_g(nutriments: Dict[str, Any]) -> Optional[float]:
-    return _get_nutriment(
-        nutriments,
+    ),
+    "sugar": (
         "sugars_100g",
         "sugars_100ml",
         "sugar_100g",
@@ -118,41 +102,84 @@ def _get_sugar_g(nutriments: Dict[str, Any]) -> Optional[float]:
         "added_sugars_100g",
         "added_sugars_100ml",
         "added_sugars",
-    )
-
-
-def _get_salt_g(nutriments: Dict[str, Any]) -> Optional[float]:
-    salt = _get_nutriment(nutriments, "salt_100g", "salt_100ml", "salt")
-    if salt is not None:
-        return salt
-    sodium = _get_nutriment(nutriments, "sodium_100g", "sodium_100ml", "sodium")
-    if sodium is None:
-        return None
-    return round(float(sodium) * 2.5, 4)
-
-
-def _get_saturated_fat_g(nutriments: Dict[str, Any]) -> Optional[float]:
-    return _get_nutriment(
-        nutriments,
+    ),
+    "salt": ("salt_100g", "salt_100ml", "salt"),
+    "sodium": ("sodium_100g", "sodium_100ml", "sodium"),
+    "sat_fat": (
         "saturated-fat_100g",
         "saturated-fat_100ml",
         "saturated_fat_100g",
         "saturated_fat_100ml",
         "saturated-fat",
         "saturated_fat",
-    )
-
-
-def _get_protein_g(nutriments: Dict[str, Any]) -> Optional[float]:
-    return _get_nutriment(
-        nutriments,
+    ),
+    "protein": (
         "proteins_100g",
         "proteins_100ml",
         "protein_100g",
         "protein_100ml",
         "proteins",
         "protein",
-    )
+    ),
+}
+_NUTRIMENT_ALIASES: Dict[str, Tuple[str, int]] = {
+    alias: (group, rank)
+    for group, aliases in _NUTRIMENT_ALIAS_GROUPS.items()
+    for rank, alias in enumerate(aliases)
+}
+
+
+def _canonical_nutriments(nutriments: Any) -> Dict[str, float]:
+    """
+    Single pass over OFF nutriments -> {canonical nutrient: value >= 0}.
+    Per nutrient, the highest-priority alias with a numeric value wins.
+    """
+    if not isinstance(nutriments, dict):
+        return {}
+    best: Dict[str, Tuple[int, float]] = {}
+    for k, v in nutriments.items():
+        hit = _NUTRIMENT_ALIASES.get(k)
+        if hit is None:
+            continue
+        group, rank = hit
+        prev = best.get(group)
+        if prev is not None and prev[0] < rank:
+            continue
+        f = _to_float(v)
+        if f is not None:
+            best[group] = (rank, f)
+    return {group: _clamp_nonneg(f) for group, (_, f) in best.items()}
+
+
+def _get_energy_kcal(canon: Dict[str, float]) -> Optional[float]:
+    direct_kcal = canon.get("energy_kcal")
+    if direct_kcal is not None:
+        return direct_kcal
+
+    kj = canon.get("energy_kj")
+    if kj is None:
+        return None
+    return round(kj / 4.184, 2)
+
+
+def _get_salt_g(canon: Dict[str, float]) -> Optional[float]:
+    salt = canon.get("salt")
+    if salt is not None:
+        return salt
+    sodium = canon.get("sodium")
+    if sodium is None:
+        return None
+    return round(float(sodium) * 2.5, 4)
+
+
+# Bounded quantities (up to 99999.999) keep backtracking short on malformed OFF strings;
+# the lookbehind stops a match from starting in the middle of a longer number.
+_SERVING_RE = re.compile(r"(?<![\d.])(\d{1,5}(?:\.\d{1,3})?)\s*(g|gr|gram|grams|ml|cl|l)\b")
+_SERVING_PAREN_RE = re.compile(r"\((\d{1,5}(?:\.\d{1,3})?)\s*(g|gr|ml|cl|l)\)")
+
+
+# g/ml per unit matched by the serving regexes
+_SERVING_UNIT_FACTORS = {"g": 1.0, "gr": 1.0, "gram": 1.0, "grams": 1.0, "ml": 1.0, "cl": 10.0, "l": 1000.0}
 
 
 def _parse_serving_size_to_g_or_ml(serving: Any) -> Optional[float]:
@@ -162,35 +189,30 @@ def _parse_serving_size_to_g_or_ml(serving: Any) -> Optional[float]:
     """
     if not serving:
         return None
-    s = str(serving).lower().strip()
+    return _parse_serving_text(str(serving).lower().strip())
+
 
-    m = re.search(r"(\d+(?:\.\d+)?)\s*(g|gr|gram|grams|ml|cl|l)\b", s)
+@lru_cache(maxsize=2048)
+def _parse_serving_text(s: str) -> Optional[float]:
+    # OFF serving strings repeat heavily across products ("30 g", "250 ml", ...), so parses are memoized
+    m = _SERVING_RE.search(s)
     if not m:
-        m = re.search(r"\((\d+(?:\.\d+)?)\s*(g|gr|ml|cl|l)\)", s)
+        m = _SERVING_PAREN_RE.search(s)
     if not m:
         return None
 
     qty = _to_float(m.group(1))
-    unit = m.group(2)
-    if qty is None:
+    factor = _SERVING_UNIT_FACTORS.get(m.group(2))
+    if qty is None or factor is None:
         return None
-
-    if unit in ("g", "gr", "gram", "grams"):
-        return float(qty)
-    if unit == "ml":
-        return float(qty)
-    if unit == "cl":
-        return float(qty) * 10.0
-    if unit == "l":
-        return float(qty) * 1000.0
-    return None
+    return float(qty) * factor
 
 
 # ---------
 # Beverage inference (robust)
 # ---------
 
-_BEVERAGE_POSITIVE = (
+_BEVERAGE_POSITIVE = frozenset({
     "en:beverages",
     "en:soft-drinks",
     "en:sodas",
@@ -205,9 +227,9 @@ _BEVERAGE_POSITIVE = (
     "en:waters",
     "en:flavoured-waters",
     "en:sports-drinks",
-)
+})
 
-_BEVERAGE_NEGATIVE = (
+_BEVERAGE_NEGATIVE = frozenset({
     "en:yogurts",
     "en:greek-yogurts",
     "en:dairy-desserts",
@@ -218,7 +240,7 @@ _BEVERAGE_NEGATIVE = (
     "en:desserts",
     "en:soups",
     "en:sauces",
-)
+})
 
 _NAME_POSITIVE = (
     "cola",
@@ -245,6 +267,14 @@ _NAME_NEGATIVE = (
 )
 
 
+# One alternation per hint list: a single C-level scan instead of a Python loop of substring checks
+_NAME_POSITIVE_RE = re.compile("|".join(re.escape(hint) for hint in _NAME_POSITIVE))
+_NAME_NEGATIVE_RE = re.compile("|".join(re.escape(hint) for hint in _NAME_NEGATIVE))
+
+_QTY_MULT_RE = re.compile(r"\b\d{1,2}\s*[x×]\s*\d{1,5}(?:\.\d{1,3})?\s*(?:ml|cl|l)\b")
+_QTY_RE = re.compile(r"\b\d{1,5}(?:\.\d{1,3})?\s*(?:ml|cl|l)\b")
+
+
 def _infer_is_beverage(off_product: Dict[str, Any]) -> Tuple[bool, bool, str]:
     """
     Returns: (is_beverage, is_inferred, reason)
@@ -263,20 +293,18 @@ def _infer_is_beverage(off_product: Dict[str, Any]) -> Tuple[bool, bool, str]:
 
     # 2) Strong signals: categories (prefer tags if present)
     cats = off_product.get("categories_tags") or []
-    cats_l = [str(c).lower() for c in cats]
+    cats_set = {str(c).lower() for c in cats}
 
-    if any(neg in cats_l for neg in _BEVERAGE_NEGATIVE):
+    if not _BEVERAGE_NEGATIVE.isdisjoint(cats_set):
         return False, False, "categories_negative"
 
-    if any(pos in cats_l for pos in _BEVERAGE_POSITIVE):
+    if not _BEVERAGE_POSITIVE.isdisjoint(cats_set):
         return True, False, "categories_positive"
 
     # 3) Heuristic: quantity looks like ml/cl/l
     quantity = str(off_product.get("quantity") or "").lower()
 
-    if re.search(r"\b(\d+)\s*[x×]\s*(\d+(?:\.\d+)?)\s*(ml|cl|l)\b", quantity) or re.search(
-        r"\b(\d+(?:\.\d+)?)\s*(ml|cl|l)\b", quantity
-    ):
+    if _QTY_MULT_RE.search(quantity) or _QTY_RE.search(quantity):
         return True, True, "quantity_ml_l"
 
     # 4) Heuristic: name/brand hints (weak)
@@ -291,9 +319,9 @@ def _infer_is_beverage(off_product: Dict[str, Any]) -> Tuple[bool, bool, str]:
     text = f"{name} {brand}".strip()
 
     if text:
-        if any(n in text for n in _NAME_NEGATIVE):
+        if _NAME_NEGATIVE_RE.search(text):
             return False, True, "name_negative"
-        if any(p in text for p in _NAME_POSITIVE):
+        if _NAME_POSITIVE_RE.search(text):
             return True, True, "name_positive"
 
     # 5) Default: solid
@@ -324,6 +352,13 @@ def _best_ingredients_text(off_product: Dict[str, Any]) -> str:
     return ""
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_LANG_PREFIX_RE = re.compile(r"^[a-z]{2}:", re.I)
+_URL_MARKER_RE = re.compile(r"(https?://|www\.|\.com\b|\.org\b|ra\.org\b)")
+_LETTER_RE = re.compile(r"[a-zà-ÿäöüßα-ω]", re.I)
+_SPLIT_ING_RE = re.compile(r"[;,]")
+
+
 def _ingredient_name_from_obj(ing: Dict[str, Any]) -> str:
     """
     Prefer canonical OFF ingredient ids over noisy raw text fragments.
@@ -337,13 +372,13 @@ def _ingredient_name_from_obj(ing: Dict[str, Any]) -> str:
         text = str(value or "").strip()
         if not text:
             return ""
-        text = re.sub(r"\s+", " ", text)
+        text = _WHITESPACE_RE.sub(" ", text)
         return text
 
     def _normalized_id(value: str) -> str:
-        canonical = re.sub(r"^[a-z]{2}:", "", value, flags=re.I)
+        canonical = _LANG_PREFIX_RE.sub("", value)
         canonical = canonical.replace("_", " ").replace("-", " ").strip()
-        canonical = re.sub(r"\s+", " ", canonical)
+        canonical = _WHITESPACE_RE.sub(" ", canonical)
         return canonical
 
     def _is_useful_text(value: str) -> bool:
@@ -352,13 +387,13 @@ def _ingredient_name_from_obj(ing: Dict[str, Any]) -> str:
             return False
         if len(tl) <= 2:
             return False
-        if re.search(r"(https?://|www\.|\.com\b|\.org\b|ra\.org\b)", tl):
+        if _URL_MARKER_RE.search(tl):
             return False
         if any(marker in tl for marker in ("zutaten", "ingredients", "ingrédients", "more at", "mehr unter", "rainforest")):
             return False
         if len(tl.split()) >= 8 and not any(ch in tl for ch in (",", ";", "%")):
             return False
-        return bool(re.search(r"[a-zà-ÿäöüßα-ω]", tl, flags=re.I))
+        return bool(_LETTER_RE.search(tl))
 
     raw_id = str(ing.get("id") or "").strip()
     text_candidates = [_clean_candidate(ing.get("text_en")), _clean_candidate(ing.get("text"))]
@@ -395,7 +430,7 @@ def _parse_ingredients_as_objects(off_product: Dict[str, Any]) -> List[Dict[str,
     if not txt:
         return []
 
-    parts = re.split(r"[;,]", txt)
+    parts = _SPLIT_ING_RE.split(txt)
     for p in parts:
         p = p.strip()
         if p:
@@ -444,11 +479,12 @@ def normalize_openfoodfacts(off_payload: Dict[str, Any], barcode: Optional[str]
         off_product = {}
     nutriments = off_product.get("nutriments") or {}
 
-    energy_kcal = _get_energy_kcal(nutriments)
-    sugar = _get_sugar_g(nutriments)
-    salt = _get_salt_g(nutriments)
-    sat_fat = _get_saturated_fat_g(nutriments)
-    protein = _get_protein_g(nutriments)
+    canon = _canonical_nutriments(nutriments)
+    energy_kcal = _get_energy_kcal(canon)
+    sugar = canon.get("sugar")
+    salt = _get_salt_g(canon)
+    sat_fat = canon.get("sat_fat")
+    protein = canon.get("protein")
 
     is_beverage, is_bev_inferred, bev_reason = _infer_is_beverage(off_product)
     unit = "ml" if is_beverage else "g"
@@ -28,6 +28,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
 from app.services.monitoring_service import log_event
 try:
@@ -63,6 +64,7 @@ ALLERGEN_CATALOG_FILE = DATA_DIR / "allergen_catalog.json"
 DIETARY_SIGNALS_CATALOG_FILE = DATA_DIR / "dietary_signals_catalog.json"
 
 _JSON_CACHE: Dict[str, Dict[str, Any]] = {}
+_LOCAL_PRODUCT_INDEX: Dict[str, Any] = {"products": None, "index": {}}
 _SCAN_RESULT_CACHE: Dict[str, Dict[str, Any]] = {}
 _SCAN_RESULT_CACHE_TTL_SEC = 10 * 60
 _SAFETY_LOOKUP_CACHE: Dict[str, Dict[str, Any]] = {}
@@ -210,7 +212,8 @@ I18N_EXPLAIN: Dict[str, Dict[str, str]] = {
 def t(lang: str, key: str, **kwargs: Any) -> str:
     lang_key = lang if lang in SUPPORTED_LANGS else "en"
     template = I18N_EXPLAIN.get(lang_key, {}).get(key) or I18N_EXPLAIN["en"].get(key) or key
-    return template.format(**kwargs)
+    # Static messages (tips, fallbacks) have no placeholders; skip formatting.
+    return template.format_map(kwargs) if kwargs else template
 
 
 VITASCORE_EXPLANATION_I18N: Dict[str, Dict[str, str]] = {
@@ -512,7 +515,11 @@ def td(lang: str, key: str, **kwargs: Any) -> str:
 # -----------------------------
 # Helpers
 # -----------------------------
-def _load_json(path: Path, default: Any) -> Any:
+def _load_json(path: Path, default: Any, *, copy_data: bool = True) -> Any:
+    """
+    Parsed JSON file, cached until the file's mtime/size changes.
+    copy_data=False returns the shared cached object; callers must treat it as read-only.
+    """
     try:
         path_str = str(path)
         if path.exists():
@@ -521,14 +528,14 @@ def _load_json(path: Path, default: Any) -> Any:
             mtime_ns = int(getattr(stat, "st_mtime_ns", 0))
             size = int(getattr(stat, "st_size", 0))
             if cache_entry and cache_entry.get("mtime_ns") == mtime_ns and cache_entry.get("size") == size:
-                return copy.deepcopy(cache_entry.get("data"))
-            data = json.loads(path.read_text(encoding="utf-8"))
+                return copy.deepcopy(cache_entry.get("data")) if copy_data else cache_entry.get("data")
+            data = orjson.loads(path.read_bytes())
             _JSON_CACHE[path_str] = {
                 "mtime_ns": mtime_ns,
                 "size": size,
                 "data": data,
             }
-            return copy.deepcopy(data)
+            return copy.deepcopy(data) if copy_data else data
     except Exception:
         pass
     return default
@@ -1177,6 +1184,9 @@ def _attach_scan_timing(data: Dict[str, Any], timing: Dict[str, Any]) -> Dict[st
 
 
 def _to_float(x: Any) -> Optional[float]:
+    # Fast path: normalized nutrition values are mostly plain floats already
+    if type(x) is float:
+        return x
     try:
         if x is None:
             return None
@@ -1221,16 +1231,24 @@ def _find_local_product(products: List[Dict[str, Any]], key: str) -> Optional[Di
     k = (key or "").strip()
     if not k:
         return None
-    for p in products:
-        if str(p.get("id", "")).strip() == k:
-            return p
-        if str(p.get("key", "")).strip() == k:
-            return p
-        if str(p.get("barcode", "")).strip() == k:
-            return p
-        if str(p.get("off_code", "")).strip() == k:
-            return p
-    return None
+    return _local_product_index(products).get(k)
+
+
+def _local_product_index(products: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    id/key/barcode/off_code -> product, first product in list order wins.
+    Rebuilt only when a different products list is passed (e.g. products.json changed).
+    """
+    if _LOCAL_PRODUCT_INDEX["products"] is not products:
+        index: Dict[str, Dict[str, Any]] = {}
+        for p in products:
+            for field in ("id", "key", "barcode", "off_code"):
+                value = str(p.get(field, "")).strip()
+                if value:
+                    index.setdefault(value, p)
+        _LOCAL_PRODUCT_INDEX["products"] = products
+        _LOCAL_PRODUCT_INDEX["index"] = index
+    return _LOCAL_PRODUCT_INDEX["index"]
 
 
 def _collect_alerts(rasff: List[Dict[str, Any]], product: Dict[str, Any]) -> List[str]:
@@ -4488,8 +4506,9 @@ def _map_net_to_vitascore(net: float, cfg: VitaScoreConfig) -> int:
     return int(round(score))
 
 
-def _who_sugar_impact(normalized: Dict[str, Any], per100: Dict[str, Optional[float]], is_beverage: bool) -> Dict[str, Any]:
-    serving_amount, unit, note = _serving_size_in_g_or_ml(normalized, is_beverage)
+def _who_sugar_impact(per100: Dict[str, Optional[float]], serving: Tuple[Optional[float], str, str]) -> Dict[str, Any]:
+    # serving = _serving_size_in_g_or_ml(...) result, resolved once per scan by the caller
+    serving_amount, unit, note = serving
     sugar_per100 = per100.get("sugar_g")
 
     sugar_per_serving = None
@@ -4602,9 +4621,10 @@ def _build_explanations(
     satfat = per100.get("saturated_fat_g")
     fiber = per100.get("fiber_g")
 
-    sugar_pts = _to_float(_get_path(breakdown, "per_100", "penalties", "sugar_points")) or 0.0
-    salt_pts = _to_float(_get_path(breakdown, "per_100", "penalties", "salt_points")) or 0.0
-    satfat_pts = _to_float(_get_path(breakdown, "per_100", "penalties", "satfat_points")) or 0.0
+    per100_pen = _get_path(breakdown, "per_100", "penalties") or {}
+    sugar_pts = _to_float(per100_pen.get("sugar_points")) or 0.0
+    salt_pts = _to_float(per100_pen.get("salt_points")) or 0.0
+    satfat_pts = _to_float(per100_pen.get("satfat_points")) or 0.0
     unit = "ml" if is_beverage else "g"
 
     if sugar is not None and sugar_pts >= 10:
@@ -4620,8 +4640,9 @@ def _build_explanations(
     if fiber is not None and fiber >= 2.5:
         why.append(t(lang, "why_fiber_bonus", value=f"{fiber:.1f}", unit=unit))
 
-    spike = _to_float(_get_path(breakdown, "per_serving", "penalties", "sugar_spike_extra")) or 0.0
-    sugar_serv = _to_float(_get_path(breakdown, "per_serving", "inputs", "sugar_g_per_serving"))
+    per_serving = _get_path(breakdown, "per_serving") or {}
+    spike = _to_float(_get_path(per_serving, "penalties", "sugar_spike_extra")) or 0.0
+    sugar_serv = _to_float(_get_path(per_serving, "inputs", "sugar_g_per_serving"))
     if sugar_serv is not None and spike > 0:
         why.append(t(lang, "why_serving_spike", value=f"{sugar_serv:.1f}"))
 
@@ -6737,7 +6758,7 @@ def _analyze_normalized_product(
             "hybrid_score": hybrid_score,
         }
 
-        who = _who_sugar_impact(norm, per100, is_bev)
+        who = _who_sugar_impact(per100, (serving_amount, serving_unit, serving_note))
         who_score, who_breakdown = _who_baseline_score(who, per100, is_beverage=is_bev)
 
         w_who = 0.85 if is_bev else 0.75
@@ -7036,12 +7057,13 @@ async def scan_product(key: str, lang: str = "en") -> Dict[str, Any]:
         return _attach_scan_timing(cached_result, cached_timing)
 
     local_load_started = time.perf_counter()
-    products = _load_json(PRODUCTS_FILE, [])
+    # Shared read-only copies: only the matched local product is deep-copied below
+    products = _load_json(PRODUCTS_FILE, [], copy_data=False)
     if isinstance(products, dict) and isinstance(products.get("products"), list):
         products = products["products"]
     elif not isinstance(products, list):
         products = []
-    rasff = _load_json(RASFF_FILE, [])
+    rasff = _load_json(RASFF_FILE, [], copy_data=False)
     timing["local_data_load_ms"] = int(round((time.perf_counter() - local_load_started) * 1000.0))
 
     matched_by = None
@@ -7053,6 +7075,7 @@ async def scan_product(key: str, lang: str = "en") -> Dict[str, Any]:
 
     local = _find_local_product(_as_list(products), key)
     if local:
+        local = copy.deepcopy(local)
         raw = local
         source = "local"
         matched_by = "local_db"
@@ -1,44 +1,65 @@
 # benchmark.py
 
-from typing import List, Dict
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Numba είναι προαιρετικό: χωρίς αυτό μένει το vectorized NumPy path
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+    njit = None
+
+# -----------------------------
+# Πίνακες κατωφλίων: searchsorted αντί για αλυσίδες if/elif
+# -----------------------------
+# calories < 120 -> 0, < 250 -> -5, < 400 -> -10, αλλιώς -15 (side="right": το 120 ανήκει ήδη στο -5)
+_CAL_THRESH = np.array([120, 250, 400], np.int16)
+_CAL_PEN = np.array([0, -5, -10, -15], np.int8)
+# sugar > 15 -> 25, > 5 -> 10, αλλιώς 0 (side="left": το 5 μένει στο 0)
+_SUGAR_THRESH = np.array([5, 15], np.int16)
+_SUGAR_PEN = np.array([0, 10, 25], np.int8)
+
+
+# -----------------------------
+# Προϊόν: slots αντί για dict, ώστε κάθε πεδίο να είναι σταθερό attribute
+# -----------------------------
+@dataclass(slots=True, frozen=True)
+class Product:
+    id: str
+    name: str
+    calories: int
+    sugar_g: int
+    fiber: int = 0
+    protein: int = 0
+    healthy_fats: bool = False
+    is_liquid: bool = False
+    liquid_penalty: int = 5
+    processing: str = ""
+    allergens: Tuple[str, ...] = ()
+
 
 # -----------------------------
 # Συνάρτηση ποινής θερμίδων
 # -----------------------------
-def calorie_penalty(product: Dict) -> int:
-    calories = product.get("calories", 0)
-    penalty = 0
-
-    # Base penalty ανά calories
-    if calories < 120:
-        penalty = 0
-    elif calories < 250:
-        penalty = -5
-    elif calories < 400:
-        penalty = -10
-    else:
-        penalty = -15
-
-    # Nutritional offsets
-    offset = 0
-    if product.get("fiber", 0) >= 3:
-        offset += 3
-    if product.get("protein", 0) >= 5:
-        offset += 3
-    if product.get("healthy_fats", False):
-        offset += 2
-    offset = min(offset, 5)
+def calorie_penalty(product: Product) -> int:
+    calories = product.calories
 
-    # Liquid penalty
-    if product.get("is_liquid", False):
-        penalty -= product.get("liquid_penalty", 5)
+    # Base penalty ανά calories: -5 για κάθε κατώφλι (120/250/400) που ξεπερνιέται, χωρίς branches
+    penalty = -5 * ((calories >= 120) + (calories >= 250) + (calories >= 400))
 
-    return penalty + offset
+    # Nutritional offsets (bool -> 0/1), με όριο 5
+    offset = min(5, 3 * (product.fiber >= 3) + 3 * (product.protein >= 5) + 2 * product.healthy_fats)
+
+    # Liquid penalty
+    return penalty + offset - product.liquid_penalty * product.is_liquid
 
 # -----------------------------
 # Λίστα προϊόντων
 # -----------------------------
-benchmark_products: List[Dict] = [
+_benchmark_rows: List[Dict] = [
     {"id":"1001","name":"Whole Wheat Bread","calories":110,"sugar_g":3,"fiber":5,"protein":4,"healthy_fats":False,"is_liquid":False,"processing":"minimally processed","allergens":["gluten"]},
     {"id":"1002","name":"Chocolate Breakfast Cereal","calories":200,"sugar_g":20,"fiber":2,"protein":3,"healthy_fats":False,"is_liquid":False,"processing":"ultra-processed","allergens":[]},
     {"id":"1003","name":"Coca-Cola 330ml","calories":139,"sugar_g":39,"fiber":0,"protein":0,"healthy_fats":False,"is_liquid":True,"liquid_penalty":10,"processing":"ultra-processed","allergens":[]},
@@ -61,36 +82,180 @@ benchmark_products: List[Dict] = [
     {"id":"1020","name":"Energy Drink 250ml","calories":110,"sugar_g":27,"fiber":0,"protein":0,"healthy_fats":False,"is_liquid":True,"liquid_penalty":10,"processing":"ultra-processed","allergens":[]},
 ]
 
+benchmark_products: List[Product] = [
+    Product(**{**row, "allergens": tuple(row.get("allergens", ()))}) for row in _benchmark_rows
+]
+
 # -----------------------------
-# Loop υπολογισμού VitaScore
+# Συνάρτηση ποινής ζάχαρης
 # -----------------------------
 def sugar_penalty(sugar: float) -> int:
-    if sugar > 15:
-        return 25
-    elif sugar > 5:
-        return 10
-    return 0
-
-for p in benchmark_products:
-    score = 100
-
-    # Ποινή ζάχαρης
-    score -= sugar_penalty(p.get("sugar_g", 0))
-
-    # Ποινή θερμίδων
-    score += calorie_penalty(p)
-
-    # Alerts
-    alerts = []
-    if p.get("sugar_g", 0) > 15:
-        alerts.append("High sugar content")
-    if score <= 70:
-        alerts.append("Calorie-dense for its nutritional value")
-    if p.get("is_liquid") and p.get("liquid_penalty", 0) > 0:
-        alerts.append("Easy to overconsume calories")
-
-    # Εμφάνιση
-    print(f"--- {p['name']} ---")
-    print(f"VitaScore: {score}")
-    print("Alerts:", alerts if alerts else "No alerts")
-    print()
+    return int(_SUGAR_PEN[np.searchsorted(_SUGAR_THRESH, sugar, side="left")])
+
+# -----------------------------
+# Record array: όλος ο πίνακας προϊόντων σε ένα συνεχές buffer (10 bytes ανά προϊόν)
+# -----------------------------
+_DTYPE = np.dtype([
+    ("calories", "i2"),
+    ("sugar_g", "i2"),
+    ("fiber", "i1"),
+    ("protein", "i1"),
+    ("healthy_fats", "?"),
+    ("is_liquid", "?"),
+    ("liquid_penalty", "i1"),
+])
+
+
+def build_records(products: List[Product]) -> np.ndarray:
+    return np.array(
+        [
+            (p.calories, p.sugar_g, p.fiber, p.protein, p.healthy_fats, p.is_liquid, p.liquid_penalty)
+            for p in products
+        ],
+        dtype=_DTYPE,
+    )
+
+
+def score_records(rec: np.ndarray) -> np.ndarray:
+    cal = rec["calories"]
+    sugar = rec["sugar_g"]
+    cal_pen = _CAL_PEN[np.searchsorted(_CAL_THRESH, cal, side="right")]
+    offset = np.minimum(
+        5,
+        3 * (rec["fiber"] >= 3).astype(np.int8)
+        + 3 * (rec["protein"] >= 5).astype(np.int8)
+        + 2 * rec["healthy_fats"].astype(np.int8),
+    )
+    liquid_adj = np.where(rec["is_liquid"], -rec["liquid_penalty"].astype(np.int16), 0)
+    sugar_pen = _SUGAR_PEN[np.searchsorted(_SUGAR_THRESH, sugar, side="left")]
+    return (100 - sugar_pen.astype(np.int16) + cal_pen + offset + liquid_adj).astype(np.int16)
+
+
+# -----------------------------
+# Numba kernel: scalar scorer ανά στοιχείο + alert bits, πάνω σε typed arrays
+# -----------------------------
+# Alert bits στο out_alerts (bit i -> _ALERT_MSGS[i])
+ALERT_HIGH_SUGAR = 1
+ALERT_CALORIE_DENSE = 2
+ALERT_OVERCONSUME = 4
+_ALERT_MSGS = (
+    "High sugar content",
+    "Calorie-dense for its nutritional value",
+    "Easy to overconsume calories",
+)
+
+
+def make_scorer(
+    cal_thresh: Tuple[int, ...] = (120, 250, 400),
+    cal_pen: Tuple[int, ...] = (-5, -10, -15),
+    sugar_thresh: Tuple[int, ...] = (5, 15),
+    sugar_pen: Tuple[int, ...] = (10, 25),
+    offset_cap: int = 5,
+):
+    """
+    Partial evaluation: παράγει scorer με τα κατώφλια ως literals στον κώδικα,
+    ώστε ο JIT να τα βλέπει ως σταθερές. Thresholds σε αύξουσα σειρά.
+    """
+    lines = [
+        "def _score(cal, sugar, fiber, protein, healthy_fats, is_liquid, liquid_penalty):",
+        "    penalty = 0",
+    ]
+    for thresh, pen in zip(cal_thresh, cal_pen):
+        lines += [f"    if cal >= {int(thresh)}:", f"        penalty = {int(pen)}"]
+    lines.append("    sugar_pen = 0")
+    for thresh, pen in zip(sugar_thresh, sugar_pen):
+        lines += [f"    if sugar > {int(thresh)}:", f"        sugar_pen = {int(pen)}"]
+    lines += [
+        "    offset = 3 * (fiber >= 3) + 3 * (protein >= 5) + 2 * healthy_fats",
+        f"    if offset > {int(offset_cap)}:",
+        f"        offset = {int(offset_cap)}",
+        "    return 100 - sugar_pen + penalty + offset - liquid_penalty * is_liquid",
+    ]
+    ns: Dict = {}
+    exec(compile("\n".join(lines) + "\n", "<make_scorer>", "exec"), ns)
+    # Χωρίς cache=True: το Numba δεν μπορεί να κάνει cache συναρτήσεις χωρίς αρχείο πηγής
+    return njit(ns["_score"]) if njit is not None else ns["_score"]
+
+
+# Ένας scorer για όλο το module, με τα default κατώφλια
+score_one = make_scorer()
+
+
+def _score_kernel(cal, sugar, fiber, protein, healthy_fats, is_liquid, liq_pen, out_score, out_alerts):
+    for i in range(cal.shape[0]):
+        s = sugar[i]
+        score = score_one(cal[i], s, fiber[i], protein[i], healthy_fats[i], is_liquid[i], liq_pen[i])
+        out_score[i] = score
+
+        flags = 0
+        if s > 15:
+            flags |= ALERT_HIGH_SUGAR
+        if score <= 70:
+            flags |= ALERT_CALORIE_DENSE
+        if is_liquid[i] and liq_pen[i] > 0:
+            flags |= ALERT_OVERCONSUME
+        out_alerts[i] = flags
+
+
+if njit is not None:
+    # Ρητό signature: γίνεται compile στο import, όχι στην πρώτη κλήση
+    score_kernel = njit(
+        "void(int16[:], int16[:], int8[:], int8[:], boolean[:], boolean[:], int8[:], int16[:], uint8[:])",
+        cache=True,
+    )(_score_kernel)
+else:
+    score_kernel = None
+
+
+# -----------------------------
+# Loop υπολογισμού VitaScore + report
+# -----------------------------
+def run_benchmark(
+    products: List[Product],
+    build=build_records,
+    score=score_records,
+    kernel=score_kernel,
+) -> None:
+    # Helpers ως default args: στο loop είναι locals (LOAD_FAST) αντί για globals
+    rec = build(products)
+
+    if kernel is not None:
+        scores = np.empty(len(products), np.int16)
+        alert_bits = np.empty(len(products), np.uint8)
+        kernel(
+            rec["calories"],
+            rec["sugar_g"],
+            rec["fiber"],
+            rec["protein"],
+            rec["healthy_fats"],
+            rec["is_liquid"],
+            rec["liquid_penalty"],
+            scores,
+            alert_bits,
+        )
+    else:
+        scores = score(rec)
+
+        # Alerts ως bitmap: ένα OR από τρεις boolean στήλες
+        alert_bits = (
+            (rec["sugar_g"] > 15).astype(np.uint8)
+            | ((scores <= 70).astype(np.uint8) << 1)
+            | ((rec["is_liquid"] & (rec["liquid_penalty"] > 0)).astype(np.uint8) << 2)
+        )
+
+    # Όλο το report χτίζεται σε buffer και γράφεται με ένα sys.stdout.write
+    buf = []
+    append = buf.append
+    for name, vita, flags in zip((p.name for p in products), scores.tolist(), alert_bits.tolist()):
+        # Τα strings φτιάχνονται μόνο για προϊόντα με alerts
+        if flags:
+            alerts = [msg for bit, msg in enumerate(_ALERT_MSGS) if flags & (1 << bit)]
+            append(f"--- {name} ---\nVitaScore: {vita}\nAlerts: {alerts}\n\n")
+        else:
+            append(f"--- {name} ---\nVitaScore: {vita}\nAlerts: No alerts\n\n")
+
+    sys.stdout.write("".join(buf))
+
+
+if __name__ == "__main__":
+    run_benchmark(benchmark_products)
@@ -0,0 +1,27 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import anyio.to_thread
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _thread_tokens(client: TestClient) -> float:
+    return client.portal.call(lambda: anyio.to_thread.current_default_thread_limiter().total_tokens)
+
+
+class ThreadpoolLimitTests(unittest.TestCase):
+    def test_startup_raises_default_thread_limiter(self) -> None:
+        with TestClient(app) as client:
+            self.assertEqual(_thread_tokens(client), 100)
+
+    def test_thread_limit_is_configurable(self) -> None:
+        with patch.dict(os.environ, {"THREADPOOL_MAX_THREADS": "64"}, clear=False):
+            with TestClient(app) as client:
+                self.assertEqual(_thread_tokens(client), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
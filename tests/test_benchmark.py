@@ -0,0 +1,68 @@
+import contextlib
+import io
+import unittest
+
+import benchmark
+
+
+def _reference_report(products) -> str:
+    lines = []
+    for p in products:
+        score = 100 - benchmark.sugar_penalty(p.sugar_g) + benchmark.calorie_penalty(p)
+        alerts = []
+        if p.sugar_g > 15:
+            alerts.append("High sugar content")
+        if score <= 70:
+            alerts.append("Calorie-dense for its nutritional value")
+        if p.is_liquid and p.liquid_penalty > 0:
+            alerts.append("Easy to overconsume calories")
+        lines.append(f"--- {p.name} ---\nVitaScore: {score}\nAlerts: {alerts if alerts else 'No alerts'}\n\n")
+    return "".join(lines)
+
+
+def _run(**kwargs) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        benchmark.run_benchmark(benchmark.benchmark_products, **kwargs)
+    return out.getvalue()
+
+
+class BenchmarkReportTests(unittest.TestCase):
+    def test_vectorized_path_matches_scalar_reference(self) -> None:
+        self.assertEqual(_run(kernel=None), _reference_report(benchmark.benchmark_products))
+
+    def test_kernel_path_matches_scalar_reference(self) -> None:
+        # The uncompiled kernel runs the same loop Numba would compile
+        self.assertEqual(_run(kernel=benchmark._score_kernel), _reference_report(benchmark.benchmark_products))
+
+    def test_report_format(self) -> None:
+        report = _run()
+        self.assertTrue(
+            report.startswith("--- Whole Wheat Bread ---\nVitaScore: 103\nAlerts: No alerts\n\n")
+        )
+        self.assertIn(
+            "--- Coca-Cola 330ml ---\nVitaScore: 60\nAlerts: ['High sugar content', "
+            "'Calorie-dense for its nutritional value', 'Easy to overconsume calories']\n\n",
+            report,
+        )
+
+
+class MakeScorerTests(unittest.TestCase):
+    def test_default_scorer_matches_scalar_penalties(self) -> None:
+        score = benchmark.make_scorer()
+        for cal in (0, 119, 120, 249, 250, 399, 400, 900):
+            for sugar in (0, 5, 6, 15, 16):
+                for fiber, protein, fats in ((0, 0, False), (3, 0, True), (3, 5, True)):
+                    for liquid, liquid_penalty in ((False, 5), (True, 10)):
+                        p = benchmark.Product("x", "x", cal, sugar, fiber, protein, fats, liquid, liquid_penalty)
+                        expected = 100 - benchmark.sugar_penalty(sugar) + benchmark.calorie_penalty(p)
+                        self.assertEqual(score(cal, sugar, fiber, protein, fats, liquid, liquid_penalty), expected)
+
+    def test_thresholds_are_baked_into_generated_scorer(self) -> None:
+        score = benchmark.make_scorer(cal_thresh=(100,), cal_pen=(-20,), sugar_thresh=(10,), sugar_pen=(30,), offset_cap=2)
+        self.assertEqual(score(100, 11, 3, 5, True, False, 0), 100 - 30 - 20 + 2)
+        self.assertEqual(score(99, 10, 0, 0, False, True, 4), 96)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,6 +37,35 @@ class FrontendHeaderTests(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("image/png", response.headers.get("content-type", ""))
 
+    def test_index_route_supports_etag_revalidation_and_gzip(self) -> None:
+        response = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/html", response.headers.get("content-type", ""))
+        self.assertEqual(response.headers.get("content-encoding"), "gzip")
+        self.assertEqual(response.headers.get("cache-control"), "no-store")
+        self.assertEqual(response.text, Path("app/frontend/index.html").read_text(encoding="utf-8"))
+        etag = response.headers.get("etag")
+        self.assertTrue(etag)
+
+        revalidated = self.client.get("/", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated.headers.get("etag"), etag)
+
+    def test_index_gzip_variant_has_weak_etag(self) -> None:
+        plain = self.client.get("/", headers={"Accept-Encoding": "identity"})
+        gzipped = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        self.assertIsNone(plain.headers.get("content-encoding"))
+        self.assertRegex(plain.headers["etag"], r'^"[0-9a-f]{32}"$')
+        self.assertEqual(gzipped.headers["etag"], f"W/{plain.headers['etag']}")
+        self.assertIn("Accept-Encoding", gzipped.headers.get("vary", ""))
+
+    def test_images_are_not_gzipped(self) -> None:
+        response = self.client.get("/static/brand/noesisfood-logo-source.png", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.headers.get("content-encoding"))
+        self.assertEqual(response.content[:8], b"\x89PNG\r\n\x1a\n")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1065,6 +1065,7 @@ class LicenseHardeningRouteTests(unittest.TestCase):
             "/health",
             "/icons",
             "/static/{asset_path:path}",
+            "/scan",
             "/scan/{key}",
             "/scan/manual",
             "/scan/photo",
@@ -225,6 +225,7 @@ class LicensingTests(unittest.TestCase):
             self.assertIn("Buy on Google Play", client.get("/").text)
             protected = [
                 ("GET", "/scan/5201005073111"),
+                ("POST", "/scan"),
                 ("POST", "/scan/manual"),
                 ("POST", "/scan/photo"),
                 ("POST", "/feedback/correction"),
@@ -255,6 +256,8 @@ class LicensingTests(unittest.TestCase):
             )
             self.assertEqual(response.headers.get("access-control-allow-origin"), "https://noesisfood.app")
             self.assertNotEqual(response.headers.get("access-control-allow-origin"), "*")
+            self.assertEqual(response.headers.get("access-control-max-age"), "86400")
+            self.assertEqual(response.headers.get("access-control-allow-methods"), "GET, POST")
 
 
 class LicensingStaticTests(unittest.TestCase):
@@ -0,0 +1,45 @@
+import copy
+import unittest
+from unittest.mock import patch
+
+from app.services import scanner_service as ss
+
+
+BARCODE = "5201002004064"
+
+
+class LocalProductLookupTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        ss._SCAN_RESULT_CACHE.clear()
+
+    def test_find_local_product_matches_any_identity_field_first_product_wins(self) -> None:
+        products = [
+            {"id": "a", "barcode": "111"},
+            {"key": "b", "off_code": "111"},
+            {"barcode": " 222 "},
+        ]
+
+        self.assertIs(ss._find_local_product(products, "111"), products[0])
+        self.assertIs(ss._find_local_product(products, "b"), products[1])
+        self.assertIs(ss._find_local_product(products, "222"), products[2])
+        self.assertIsNone(ss._find_local_product(products, "333"))
+        self.assertIsNone(ss._find_local_product(products, " "))
+
+    async def test_scan_of_local_product_leaves_shared_products_cache_untouched(self) -> None:
+        shared = ss._load_json(ss.PRODUCTS_FILE, {}, copy_data=False)
+        before = copy.deepcopy(shared)
+
+        with patch.object(
+            ss,
+            "_lookup_external_safety_alerts",
+            return_value={"checked": False, "source": None, "has_matches": False, "alerts": []},
+        ):
+            result = await ss.scan_product(BARCODE, lang="en")
+
+        self.assertEqual(result["product"]["barcode"], BARCODE)
+        self.assertIs(ss._load_json(ss.PRODUCTS_FILE, {}, copy_data=False), shared)
+        self.assertEqual(shared, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
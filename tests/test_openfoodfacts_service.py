@@ -0,0 +1,213 @@
+import asyncio
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from app.services import openfoodfacts_service as off
+
+
+class OpenFoodFactsServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        off._CACHE.clear()
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            barcode = request.url.path.rsplit("/", 1)[-1].removesuffix(".json")
+            if barcode == "0000000000000":
+                return httpx.Response(404, json={"status": 0, "code": barcode, "status_verbose": "product not found"})
+            return httpx.Response(200, json={"status": 1, "code": barcode, "product": {"product_name": "Test"}})
+
+        off._CLIENT = httpx.AsyncClient(base_url=off.OFF_BASE, transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self) -> None:
+        await off.close_off_client()
+        off._CACHE.clear()
+
+    async def test_fetch_reuses_shared_client_across_calls(self) -> None:
+        client = off._CLIENT
+
+        first = await off.fetch_off_product("5201002004064")
+        second = await off.fetch_off_product("5201002004071")
+
+        self.assertTrue(first.ok)
+        self.assertTrue(second.ok)
+        self.assertIs(off._CLIENT, client)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[0].url.path, "/api/v2/product/5201002004064.json")
+        self.assertIn("NoesisFood", self.requests[0].headers["user-agent"])
+
+    async def test_concurrent_lookups_of_same_barcode_share_one_request(self) -> None:
+        results = await asyncio.gather(*(off.fetch_off_product("5201002004064") for _ in range(5)))
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(off._INFLIGHT, {})
+
+    async def test_finished_stale_task_does_not_drop_its_replacement(self) -> None:
+        loop = asyncio.get_running_loop()
+        stale = loop.create_future()
+        current = loop.create_future()
+        off._INFLIGHT["off:1"] = current
+
+        off._forget_inflight("off:1", stale)
+        self.assertIs(off._INFLIGHT["off:1"], current)
+
+        off._forget_inflight("off:1", current)
+        self.assertNotIn("off:1", off._INFLIGHT)
+
+    async def test_not_found_result_is_cached_with_short_ttl(self) -> None:
+        with patch.object(off, "_now", return_value=1000.0):
+            first = await off.fetch_off_product("0000000000000")
+            second = await off.fetch_off_product("0000000000000")
+
+        self.assertEqual((first.ok, first.status), (False, 404))
+        self.assertEqual((second.ok, second.status), (False, 404))
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(off._CACHE["off:0000000000000"]["expires_at"], 1000.0 + off._NEGATIVE_CACHE_TTL_SEC)
+
+        with patch.object(off, "_now", return_value=1000.0 + off._NEGATIVE_CACHE_TTL_SEC):
+            await off.fetch_off_product("0000000000000")
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_close_resets_client_for_lazy_recreation(self) -> None:
+        await off.close_off_client()
+
+        self.assertIsNone(off._CLIENT)
+
+
+class OpenFoodFactsCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        off._CACHE.clear()
+
+    def tearDown(self) -> None:
+        off._CACHE.clear()
+
+    def test_cache_evicts_least_recently_used_entry_when_full(self) -> None:
+        with patch.object(off, "_CACHE_MAX_ENTRIES", 2):
+            off._cache_set("off:a", {"code": "a"})
+            off._cache_set("off:b", {"code": "b"})
+            self.assertEqual(off._cache_get("off:a"), {"code": "a"})
+            off._cache_set("off:c", {"code": "c"})
+
+        self.assertEqual(list(off._CACHE), ["off:a", "off:c"])
+        self.assertIsNone(off._cache_get("off:b"))
+
+    def test_ttl_shrinks_between_low_and_high_water_marks(self) -> None:
+        with patch.object(off, "_CACHE_LOW_WATER_ENTRIES", 2), patch.object(off, "_CACHE_MAX_ENTRIES", 6):
+            self.assertEqual(off._adaptive_ttl(600), 600)
+            for index in range(4):
+                off._CACHE[f"off:{index}"] = {"expires_at": 0.0, "data": {}}
+            self.assertAlmostEqual(off._adaptive_ttl(600), 300)
+            for index in range(4, 6):
+                off._CACHE[f"off:{index}"] = {"expires_at": 0.0, "data": {}}
+            self.assertAlmostEqual(off._adaptive_ttl(600), 60)
+
+    def test_cache_entry_expires_after_ttl(self) -> None:
+        with patch.object(off, "_now", return_value=1000.0):
+            off._cache_set("off:a", {"code": "a"})
+        with patch.object(off, "_now", return_value=1000.0 + off._CACHE_TTL_SEC):
+            self.assertIsNone(off._cache_get("off:a"))
+        self.assertNotIn("off:a", off._CACHE)
+
+
+class OpenFoodFactsDiskCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        off._CACHE.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(off, "OFF_CACHE_DB_PATH", str(Path(tmp.name) / "off-cache.sqlite3"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self) -> None:
+        await off.close_off_client()
+        off._CACHE.clear()
+
+    async def test_unavailable_disk_cache_is_retried_with_backoff(self) -> None:
+        missing = str(Path(off.OFF_CACHE_DB_PATH).parent / "missing" / "off-cache.sqlite3")
+        with patch.object(off, "OFF_CACHE_DB_PATH", missing), patch.object(off, "_disk_cache_retry_at", 0.0), patch.object(
+            off, "_now", return_value=1000.0
+        ), self.assertLogs("noesisfood.openfoodfacts", level="WARNING") as logs:
+            for index in range(200):
+                off._cache_set(f"off:{index}", {"code": index})
+                off._CACHE.clear()
+                self.assertIsNone(off._cache_get(f"off:{index}"))
+            self.assertEqual(len(logs.records), 1)
+
+            off._now.return_value = 1000.0 + off._DISK_CACHE_RETRY_SEC
+            off._cache_get("off:0")
+            self.assertEqual(len(logs.records), 2)
+
+    async def test_locked_database_is_skipped_without_waiting(self) -> None:
+        off._cache_set("off:warm", {"code": "warm"})
+        other = sqlite3.connect(off.OFF_CACHE_DB_PATH, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        self.addCleanup(other.execute, "ROLLBACK")
+
+        started = time.perf_counter()
+        with self.assertNoLogs("noesisfood.openfoodfacts", level="WARNING"):
+            off._cache_set("off:a", {"code": "a"})
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(off._cache_get("off:a"), {"code": "a"})
+
+    async def test_entries_survive_restart_and_promote_into_memory(self) -> None:
+        off._cache_set("off:a", {"code": "a", "product": {"product_name": "Test"}})
+        await off.close_off_client()
+        off._CACHE.clear()
+
+        self.assertEqual(off._cache_get("off:a"), {"code": "a", "product": {"product_name": "Test"}})
+        self.assertIn("off:a", off._CACHE)
+
+    async def test_promoted_entries_keep_memory_pressure_ttl(self) -> None:
+        with patch.object(off, "_CACHE_LOW_WATER_ENTRIES", 0), patch.object(off, "_CACHE_MAX_ENTRIES", 2), patch.object(
+            off, "_now", return_value=1000.0
+        ):
+            # Full cache: adaptive TTL is at its 10% floor (60 s) for L1, L2 keeps the full 600 s
+            off._CACHE["off:filler-1"] = {"expires_at": 9999.0, "data": {}}
+            off._CACHE["off:filler-2"] = {"expires_at": 9999.0, "data": {}}
+            off._cache_set("off:a", {"code": "a"})
+            self.assertEqual(off._CACHE["off:a"]["expires_at"], 1000.0 + 60)
+
+            off._now.return_value = 1061.0
+            off._CACHE["off:filler-3"] = {"expires_at": 9999.0, "data": {}}
+            self.assertEqual(off._cache_get("off:a"), {"code": "a"})
+            self.assertEqual(off._CACHE["off:a"]["expires_at"], 1061.0 + 60)
+
+    async def test_promoted_negative_entries_keep_short_ttl(self) -> None:
+        with patch.object(off, "_now", return_value=1000.0):
+            off._cache_set("off:missing", {"_neg": True}, ttl=off._NEGATIVE_CACHE_TTL_SEC)
+        off._CACHE.clear()
+        with patch.object(off, "_now", return_value=1010.0):
+            self.assertEqual(off._cache_get("off:missing"), {"_neg": True})
+        self.assertEqual(off._CACHE["off:missing"]["expires_at"], 1000.0 + off._NEGATIVE_CACHE_TTL_SEC)
+
+    async def test_expired_disk_entries_are_ignored(self) -> None:
+        with patch.object(off, "_now", return_value=1000.0):
+            off._cache_set("off:a", {"code": "a"})
+        off._CACHE.clear()
+        with patch.object(off, "_now", return_value=1000.0 + off._CACHE_TTL_SEC):
+            self.assertIsNone(off._cache_get("off:a"))
+
+    async def test_negative_lookups_are_persisted(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404, json={"status": 0})
+
+        off._CLIENT = httpx.AsyncClient(base_url=off.OFF_BASE, transport=httpx.MockTransport(handler))
+        await off.fetch_off_product("0000000000000")
+        await off.close_off_client()
+        off._CACHE.clear()
+
+        with patch.object(off, "_fetch_uncached", side_effect=AssertionError("disk cache should answer")):
+            result = await off.fetch_off_product("0000000000000")
+        self.assertEqual(result.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
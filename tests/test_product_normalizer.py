@@ -0,0 +1,95 @@
+import unittest
+
+from app.services.product_normalizer import (
+    _canonical_nutriments,
+    _infer_is_beverage,
+    _parse_serving_size_to_g_or_ml,
+    _parse_serving_text,
+    _to_float,
+    normalize_openfoodfacts,
+)
+
+
+class ToFloatTests(unittest.TestCase):
+    def test_converts_numbers_and_numeric_strings(self) -> None:
+        self.assertEqual(_to_float(2.5), 2.5)
+        self.assertEqual(_to_float(3), 3.0)
+        self.assertIsInstance(_to_float(3), float)
+        self.assertEqual(_to_float(True), 1.0)
+        self.assertEqual(_to_float(" 1,5 "), 1.5)
+
+    def test_returns_none_for_missing_or_invalid_values(self) -> None:
+        self.assertIsNone(_to_float(None))
+        self.assertIsNone(_to_float(""))
+        self.assertIsNone(_to_float("n/a"))
+        self.assertIsNone(_to_float(10**400))
+
+
+class ServingSizeParsingTests(unittest.TestCase):
+    def test_parses_common_serving_units(self) -> None:
+        self.assertEqual(_parse_serving_size_to_g_or_ml("30 g"), 30.0)
+        self.assertEqual(_parse_serving_size_to_g_or_ml("250ml"), 250.0)
+        self.assertEqual(_parse_serving_size_to_g_or_ml("33 cl"), 330.0)
+        self.assertEqual(_parse_serving_size_to_g_or_ml("0.33 L"), 330.0)
+        self.assertEqual(_parse_serving_size_to_g_or_ml("1 portion (40 grams)"), 40.0)
+
+    def test_does_not_match_inside_longer_numbers(self) -> None:
+        self.assertIsNone(_parse_serving_size_to_g_or_ml("1234567 g"))
+        self.assertIsNone(_parse_serving_size_to_g_or_ml("12.34567 g"))
+        self.assertIsNone(_parse_serving_size_to_g_or_ml("one slice"))
+
+    def test_malformed_serving_text_is_handled_quickly(self) -> None:
+        self.assertIsNone(_parse_serving_size_to_g_or_ml("1" * 5000 + "x"))
+        self.assertIsNone(_parse_serving_size_to_g_or_ml("1." * 5000))
+
+    def test_repeated_serving_strings_are_parsed_once(self) -> None:
+        _parse_serving_text.cache_clear()
+        for raw in ("30 g", " 30 G ", "250 ml", "30 g"):
+            self.assertIsNotNone(_parse_serving_size_to_g_or_ml(raw))
+        info = _parse_serving_text.cache_info()
+        self.assertEqual((info.misses, info.hits), (2, 2))
+
+
+class BeverageQuantityInferenceTests(unittest.TestCase):
+    def test_multipack_and_single_volume_quantities_infer_beverage(self) -> None:
+        for quantity in ("6x330ml", "6 × 0.5 l", "1,5 l", "500 ml"):
+            with self.subTest(quantity=quantity):
+                self.assertEqual(_infer_is_beverage({"quantity": quantity}), (True, True, "quantity_ml_l"))
+
+    def test_weight_quantity_defaults_to_solid(self) -> None:
+        self.assertEqual(_infer_is_beverage({"quantity": "4 x 125 g"}), (False, True, "default_solid"))
+
+
+class BeverageCategoryInferenceTests(unittest.TestCase):
+    def test_negative_category_tags_win_over_positive(self) -> None:
+        product = {"categories_tags": ["en:beverages", "en:Fermented-Milk-Products"], "quantity": "500 ml"}
+        self.assertEqual(_infer_is_beverage(product), (False, False, "categories_negative"))
+
+    def test_positive_category_tag_is_strong_signal(self) -> None:
+        self.assertEqual(_infer_is_beverage({"categories_tags": ["en:colas"]}), (True, False, "categories_positive"))
+
+
+class BeverageNameHintTests(unittest.TestCase):
+    def test_name_hints_prefer_negative_over_positive(self) -> None:
+        self.assertEqual(_infer_is_beverage({"product_name": "Drinking yogurt water"}), (False, True, "name_negative"))
+        self.assertEqual(_infer_is_beverage({"product_name": "Sparkling Lemon", "brands": "Acme"}), (True, True, "name_positive"))
+        self.assertEqual(_infer_is_beverage({"product_name": "Cheddar cheese", "brands": "Coca-Cola"}), (False, True, "name_negative"))
+
+
+class CanonicalNutrimentsTests(unittest.TestCase):
+    def test_highest_priority_numeric_alias_wins_regardless_of_key_order(self) -> None:
+        canon = _canonical_nutriments(
+            {"sugars": 9.0, "sugars_100g": "n/a", "sugar_100g": "4,5", "salt": -1, "proteins_100g": 3}
+        )
+        self.assertEqual(canon, {"sugar": 4.5, "salt": 0.0, "protein": 3.0})
+
+    def test_normalizer_falls_back_to_kj_and_sodium(self) -> None:
+        normalized = normalize_openfoodfacts(
+            {"product": {"product_name": "Test", "nutriments": {"energy_100g": 418.4, "sodium_100g": 0.4}}}
+        )
+        self.assertEqual(normalized["nutrition_per_100"]["energy_kcal"], 100.0)
+        self.assertEqual(normalized["nutrition_per_100"]["salt_g"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.api.routes.scan import _render_scan
+from app.main import app
+from app.services import scanner_service as ss
+
+
+BARCODE = "5205757000067"
+IDENTITY = {"Accept-Encoding": "identity"}
+NO_ALERTS = {"checked": False, "source": None, "has_matches": False, "alerts": []}
+
+
+class ScanEtagTests(unittest.TestCase):
+    def setUp(self) -> None:
+        ss._SCAN_RESULT_CACHE.clear()
+        self.client = TestClient(app)
+        patcher = patch.object(ss, "_lookup_external_safety_alerts", return_value=NO_ALERTS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_etag_ignores_per_request_timings(self) -> None:
+        first = self.client.get(f"/scan/{BARCODE}", headers=IDENTITY)
+        ss._SCAN_RESULT_CACHE.clear()
+        second = self.client.get(f"/scan/{BARCODE}", headers=IDENTITY)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertRegex(first.headers["etag"], r'^"[0-9a-f]{16}"$')
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+
+    def test_gzip_variant_gets_weak_etag(self) -> None:
+        plain = self.client.get(f"/scan/{BARCODE}", headers=IDENTITY)
+        gzipped = self.client.get(f"/scan/{BARCODE}", headers={"Accept-Encoding": "gzip"})
+
+        self.assertIsNone(plain.headers.get("content-encoding"))
+        self.assertEqual(gzipped.headers["content-encoding"], "gzip")
+        self.assertEqual(gzipped.headers["etag"], f"W/{plain.headers['etag']}")
+
+        self.assertIn("Accept-Encoding", gzipped.headers.get("vary", ""))
+
+        revalidated = self.client.get(f"/scan/{BARCODE}", headers={"If-None-Match": gzipped.headers["etag"]})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers.get("vary"), "Accept-Encoding")
+
+    def test_matching_if_none_match_returns_304(self) -> None:
+        etag = self.client.get(f"/scan/{BARCODE}", headers=IDENTITY).headers["etag"]
+
+        cached = self.client.get(f"/scan/{BARCODE}", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached.headers["etag"], etag)
+
+        stale = self.client.get(f"/scan/{BARCODE}", headers={"If-None-Match": '"0000000000000000"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json()["product"]["barcode"], BARCODE)
+
+    def test_etag_differs_per_language(self) -> None:
+        en = self.client.get(f"/scan/{BARCODE}", params={"lang": "en"})
+        el = self.client.get(f"/scan/{BARCODE}", params={"lang": "el"})
+        self.assertNotEqual(en.headers["etag"], el.headers["etag"])
+
+    def test_render_matches_orjson_response_and_handles_non_str_keys(self) -> None:
+        data = {"score": np.int64(7), "levels": {1: "low"}, "meta": {"serving": "30 g", "performance": {"total_ms": 12}}}
+        body, etag = _render_scan(data)
+        self.assertEqual(body, ORJSONResponse(content=data).body)
+
+        data["meta"]["performance"] = {"total_ms": 99}
+        later_body, later_etag = _render_scan(data)
+        self.assertNotEqual(later_body, body)
+        self.assertEqual(later_etag, etag)
+
+
+class ScanBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(app)
+
+    def test_batch_returns_results_in_request_order_and_dedupes_lookups(self) -> None:
+        calls = []
+
+        async def fake_scan(key, lang="en"):
+            calls.append((key, lang))
+            if key == "boom":
+                raise RuntimeError("upstream failure")
+            if key == "cancelled":
+                raise asyncio.CancelledError()
+            return {"key": key, "lang": lang}
+
+        with patch("app.api.routes.scan.scan_product", side_effect=fake_scan):
+            response = self.client.post("/scan", params={"lang": "el"}, json={"ids": ["111", " 222 ", "111", "boom", "cancelled"]})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r.get("key") for r in results[:3]], ["111", "222", "111"])
+        self.assertEqual(results[3]["error_code"], "ANALYSIS_UNAVAILABLE")
+        self.assertEqual(results[4]["error_code"], "ANALYSIS_UNAVAILABLE")
+        self.assertEqual(sorted(calls), [("111", "el"), ("222", "el"), ("boom", "el"), ("cancelled", "el")])
+
+    def test_batch_rejects_invalid_payloads(self) -> None:
+        too_many = {"ids": [str(i) for i in range(21)]}
+        for payload in ({}, {"ids": []}, {"ids": "123"}, {"ids": ["123", ""]}, too_many):
+            with self.subTest(payload=payload):
+                response = self.client.post("/scan", json=payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["error_code"], "INVALID_BATCH")
+
+
+if __name__ == "__main__":
+    unittest.main()